@@ -9,6 +9,14 @@ import os
 from pathlib import Path
 from datetime import datetime
 
+# Add hooks directory to path to import the index reader module
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from index_reader import index_exists, load_index_fields
+from todo_persister import load_pending_todos
+
+# Bytes read from the end of bash_history.log
+HISTORY_TAIL_BYTES = 8192
+
 def extract_critical_context():
     """Extract critical context to preserve during compaction."""
     context_parts = []
@@ -16,9 +24,8 @@ def extract_critical_context():
     
     # Load current index summary
     index_path = Path(project_root) / '.claude' / '.index.json'
-    if index_path.exists():
-        with open(index_path) as f:
-            index = json.load(f)
+    if index_exists(index_path):
+        index = load_index_fields(index_path, ['stats', 'critical_files', 'entry_points'])
             
         context_parts.append("## Project Context to Preserve:")
         context_parts.append(f"- Project has {index['stats']['total_files']} files")
@@ -32,13 +39,18 @@ def extract_critical_context():
     bash_log = Path(project_root) / '.claude' / 'bash_history.log'
     if bash_log.exists():
         try:
-            with open(bash_log) as f:
-                lines = f.readlines()
-                if lines:
-                    recent_commands = lines[-10:]  # Last 10 commands
-                    context_parts.append("\n## Recent Commands Used:")
-                    for cmd in recent_commands[-5:]:  # Show last 5
-                        context_parts.append(f"- {cmd.strip()}")
+            # Only the end of the log is needed, however large it grows
+            size = bash_log.stat().st_size
+            with open(bash_log, 'rb') as f:
+                f.seek(max(0, size - HISTORY_TAIL_BYTES))
+                lines = f.read().decode('utf-8', 'ignore').splitlines()
+            if size > HISTORY_TAIL_BYTES:
+                lines = lines[1:]  # First line may be cut mid-command
+            if lines:
+                recent_commands = lines[-10:]  # Last 10 commands
+                context_parts.append("\n## Recent Commands Used:")
+                for cmd in recent_commands[-5:]:  # Show last 5
+                    context_parts.append(f"- {cmd.strip()}")
         except:
             pass
     
@@ -46,14 +58,11 @@ def extract_critical_context():
     todo_path = Path(project_root) / '.claude' / '.todo_state.json'
     if todo_path.exists():
         try:
-            with open(todo_path) as f:
-                state = json.load(f)
-                todos = state.get('todos', [])
-                pending = [t for t in todos if t.get('status') == 'pending']
-                if pending:
-                    context_parts.append("\n## Current Tasks:")
-                    for todo in pending[:5]:
-                        context_parts.append(f"- {todo['content']}")
+            pending = load_pending_todos(todo_path, limit=5)
+            if pending:
+                context_parts.append("\n## Current Tasks:")
+                for todo in pending:
+                    context_parts.append(f"- {todo['content']}")
         except:
             pass
     
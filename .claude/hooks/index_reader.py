@@ -0,0 +1,109 @@
+"""
+Project Index Reader
+Lightweight loaders for the index written by indexer.py, kept free of the
+indexer's scanning dependencies so context hooks start quickly
+"""
+import json
+import os
+import mmap
+from pathlib import Path
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Top-level index fields and the shard each one is stored in
+INDEX_FIELDS = [
+    "version", "generated", "root", "stats", "structure",
+    "critical_files", "entry_points", "test_files", "dependencies_graph"
+]
+META_FIELDS = ["version", "generated", "root"]
+STATS_FIELDS = ["stats", "critical_files", "entry_points", "test_files"]
+
+# Directory names skipped when walking the project, shared by the hooks
+IGNORE_DIRS = frozenset({
+    '.git', 'node_modules', '__pycache__', '.pytest_cache',
+    'dist', 'build', 'target', '.next', '.venv', 'env'
+})
+
+def shard_dir(index_path):
+    """Directory holding the sharded index next to .index.json."""
+    return Path(index_path).with_name('.index')
+
+def index_exists(index_path):
+    """Check whether a sharded or legacy index has been written."""
+    return (shard_dir(index_path) / 'meta.json').exists() or Path(index_path).exists()
+
+def iter_dependencies(index_path):
+    """Yield (file, dependencies) pairs without loading the whole graph."""
+    deps_path = shard_dir(index_path) / 'deps.json'
+    if deps_path.exists():
+        with open(deps_path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    yield entry["path"], entry["dependencies"]
+    else:
+        graph = load_index_fields(index_path, ['dependencies_graph']).get('dependencies_graph', {})
+        yield from graph.items()
+
+def _load_json_fast(path):
+    """Parse a JSON file through a read-only memory map.
+    
+    Pages are faulted in on demand and stay in the page cache across hook
+    invocations. Uses orjson when available.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"empty JSON file: {path}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if orjson is not None:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+            return json.loads(mm.read().decode('utf-8'))
+
+def _load_shard_fields(shards, fields):
+    """Read the requested fields from only the shards that hold them."""
+    data = {}
+    for shard, shard_fields in [('meta.json', META_FIELDS), ('stats.json', STATS_FIELDS)]:
+        wanted = [key for key in shard_fields if key in fields]
+        if wanted:
+            content = _load_json_fast(shards / shard)
+            data.update((key, content[key]) for key in wanted)
+    
+    if 'structure' in fields:
+        data['structure'] = _load_json_fast(shards / 'structure.json')
+    if 'dependencies_graph' in fields:
+        data['dependencies_graph'] = dict(iter_dependencies(shards.with_name('.index.json')))
+    return data
+
+def load_index_fields(index_path, fields):
+    """Load only the given top-level fields of a saved index.
+    
+    Reads just the shards containing those fields. Without shards, streams
+    the legacy .index.json with ijson when available and stops as soon as
+    every requested field has been read, else falls back to json.load.
+    """
+    fields = set(fields)
+    shards = shard_dir(index_path)
+    if (shards / 'meta.json').exists():
+        return _load_shard_fields(shards, fields)
+    
+    if ijson is None:
+        index = _load_json_fast(index_path)
+        return {key: value for key, value in index.items() if key in fields}
+    
+    data = {}
+    with open(index_path, 'rb') as f:
+        for key, value in ijson.kvitems(f, '', use_float=True):
+            if key in fields:
+                data[key] = value
+                if len(data) == len(fields):
+                    break
+    return data
@@ -8,59 +8,232 @@ import sys
 import os
 import re
 import hashlib
+import stat
+import time
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-def get_file_info(file_path):
-    """Extract metadata and dependencies from a file."""
+from index_reader import (IGNORE_DIRS, INDEX_FIELDS, META_FIELDS, STATS_FIELDS,
+                          index_exists, load_index_fields, shard_dir)
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Patterns used by get_file_info, compiled once per process
+_JS_IMPORT_RE = re.compile(r"(?:import|require)\s*\(?['\"]([^'\"]+)['\"]")
+_JS_EXPORT_RE = re.compile(r"export\s+(?:default\s+)?(?:class|function|const|let|var)\s+(\w+)")
+_PY_IMPORT_RE = re.compile(r"^(?:from\s+(\S+)|import\s+(\S+))", re.M)
+_PY_DEF_RE = re.compile(r"^(?:class|def)\s+(\w+)", re.M)
+_RS_USE_RE = re.compile(r"use\s+([^;]+);")
+_TEST_FILE_RE = re.compile(r"(test|spec)\.(js|ts)x?$")
+_CONFIG_FILE_RE = re.compile(r"(config|setup)", re.I)
+
+# Larger files are indexed from stat alone and never read
+MAX_PARSE_BYTES = 100000
+
+# Only the head of a file is scanned; imports live at the top
+HEAD_BYTES = 8192
+
+# Thread count for full scans, which are dominated by file I/O
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Window for coalescing queued hook updates into one index rewrite
+DEBOUNCE_SECONDS = 0.25
+
+# Per-file labels shared by many entries, kept as interned strings
+LABEL_FIELDS = ("type", "purpose", "importance")
+
+# Files and directories the indexer itself writes under .claude; never indexed
+INDEX_ARTIFACTS = frozenset({
+    '.index', '.index.json', '.index_meta.json', '.index_queue', '.index.pid'
+})
+
+def _is_index_artifact(name):
+    """Check a name directly under .claude against the indexer's own output.
+    
+    Also matches the "<name>.<pid>.tmp" files left by in-flight atomic writes.
+    """
+    if name.endswith('.tmp'):
+        name = name.rsplit('.', 2)[0]
+    return name in INDEX_ARTIFACTS
+
+def _content_hash(data):
+    """Hash file bytes for cache validation (not security sensitive).
+    
+    Only files small enough to parse (MAX_PARSE_BYTES) are hashed, using the
+    bytes already read for parsing. The hash is only consulted after an
+    mtime change and a hit also requires an equal size, so a
+    non-cryptographic hash is enough.
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_64(data).hexdigest()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+def _intern_labels(info):
+    """Intern the short labels repeated across every file entry.
+    
+    Literal purposes and importances are already interned by the compiler;
+    this covers file types sliced from names and labels decoded from JSON.
+    """
+    for key in LABEL_FIELDS:
+        info[key] = sys.intern(info[key])
+    return info
+
+def _meta_cache_load(index_path):
+    """Load the per-file metadata cache stored next to the index.
+
+    Returns {rel_path: {"mtime": ..., "size": ..., "hash": ..., "info": {...}}}.
+    """
+    meta_path = Path(index_path).with_name('.index_meta.json')
+    try:
+        if orjson is not None:
+            cache = orjson.loads(meta_path.read_bytes())
+        else:
+            with open(meta_path) as f:
+                cache = json.load(f)
+        if not isinstance(cache, dict):
+            return {}
+        for entry in cache.values():
+            _intern_labels(entry["info"])
+        return cache
+    except Exception:
+        return {}
+
+def _meta_cache_save(index_path, cache):
+    """Persist the per-file metadata cache next to the index."""
+    _write_json_atomic(Path(index_path).with_name('.index_meta.json'), cache)
+
+def _scan_file(file_path, entry=None, st=None):
+    """Return an up-to-date cache entry for a file.
+    
+    The cached entry's info is reused when the file is unchanged.
+    """
+    st = st or file_path.stat()
+    
+    if entry and entry.get("mtime") == st.st_mtime_ns and entry.get("size") == st.st_size:
+        return entry
+    
+    if not stat.S_ISREG(st.st_mode) or st.st_size > MAX_PARSE_BYTES:
+        # Never parsed, so stat alone describes it; don't read it to hash
+        return {
+            "mtime": st.st_mtime_ns,
+            "size": st.st_size,
+            "hash": None,
+            "info": get_file_info(file_path, st)
+        }
+    
+    # Read once: the same bytes are hashed and parsed
+    try:
+        data = file_path.read_bytes()
+        digest = _content_hash(data)
+    except OSError:
+        data = digest = None
+    
+    if (entry and digest is not None and entry.get("size") == st.st_size
+            and entry.get("hash") == digest):
+        # Content unchanged (e.g. git checkout touched mtime), only refresh stat
+        info = entry["info"]
+        info["modified"] = datetime.fromtimestamp(st.st_mtime).isoformat()
+    else:
+        info = get_file_info(file_path, st, data)
+    
+    return {
+        "mtime": st.st_mtime_ns,
+        "size": st.st_size,
+        "hash": digest,
+        "info": info
+    }
+
+def _read_chunk(file_path, size=None, from_end=False, data=None):
+    """Read up to size bytes from the start (or end) of a file as text.
+    
+    Slices data instead when the file's bytes were already read.
+    """
+    if data is not None:
+        if size is not None:
+            data = data[-size:] if from_end else data[:size]
+        return data.decode('utf-8', 'ignore')
+    with file_path.open('rb') as f:
+        if from_end:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - size))
+        return f.read(size).decode('utf-8', 'ignore')
+
+def get_file_info(file_path, st=None, data=None):
+    """Extract metadata and dependencies from a file.
+    
+    Pass an existing stat result (e.g. from DirEntry.stat()) to avoid
+    re-statting the file, and data when its bytes were already read.
+    """
+    st = st or file_path.stat()
     info = {
         "path": str(file_path),
-        "type": file_path.suffix[1:] if file_path.suffix else "none",
-        "size": file_path.stat().st_size,
-        "modified": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat(),
+        "type": sys.intern(file_path.suffix[1:]) if file_path.suffix else "none",
+        "size": st.st_size,
+        "modified": datetime.fromtimestamp(st.st_mtime).isoformat(),
         "dependencies": [],
         "exports": [],
         "purpose": "",
         "importance": "normal"
     }
     
-    if not file_path.is_file() or file_path.stat().st_size > 100000:
+    if not stat.S_ISREG(st.st_mode) or st.st_size > MAX_PARSE_BYTES:
         return info
         
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        content = _read_chunk(file_path, HEAD_BYTES, data=data)
+        truncated = info["size"] > HEAD_BYTES
         
         # JavaScript/TypeScript analysis
         if file_path.suffix in ['.js', '.ts', '.jsx', '.tsx']:
             # Find imports
-            imports = re.findall(r"(?:import|require)\s*\(?['\"]([^'\"]+)['\"]", content)
+            imports = _JS_IMPORT_RE.findall(content)
+            if not imports and truncated:
+                # Imports may follow a long license header; scan everything
+                content = _read_chunk(file_path, data=data)
+                imports = _JS_IMPORT_RE.findall(content)
             info["dependencies"] = list(set(imports))
             
             # Find exports
-            exports = re.findall(r"export\s+(?:default\s+)?(?:class|function|const|let|var)\s+(\w+)", content)
+            exports = _JS_EXPORT_RE.findall(content)
             info["exports"] = list(set(exports))
             
             # Detect purpose
-            if re.search(r"(test|spec)\.(js|ts)x?$", str(file_path)):
+            if _TEST_FILE_RE.search(str(file_path)):
                 info["purpose"] = "test"
                 info["importance"] = "low"
             elif "index" in file_path.name:
                 info["purpose"] = "entry_point"
                 info["importance"] = "high"
-            elif re.search(r"(config|setup)", file_path.name, re.I):
+            elif _CONFIG_FILE_RE.search(file_path.name):
                 info["purpose"] = "configuration"
                 info["importance"] = "high"
                 
         # Python analysis
         elif file_path.suffix == '.py':
-            imports = re.findall(r"^(?:from\s+(\S+)|import\s+(\S+))", content, re.M)
+            imports = _PY_IMPORT_RE.findall(content)
             info["dependencies"] = list(set([i[0] or i[1] for i in imports]))
             
             # Find class/function definitions
-            defs = re.findall(r"^(?:class|def)\s+(\w+)", content, re.M)
+            defs = _PY_DEF_RE.findall(content)
             info["exports"] = list(set(defs))
             
-            if "__main__" in content:
+            # The __main__ guard usually sits at the bottom of the file
+            if "__main__" in content or (
+                    truncated and "__main__" in _read_chunk(file_path, HEAD_BYTES, from_end=True, data=data)):
                 info["purpose"] = "script"
                 info["importance"] = "high"
             elif "test_" in file_path.name or "_test" in file_path.name:
@@ -69,7 +242,7 @@ def get_file_info(file_path):
                 
         # Rust analysis
         elif file_path.suffix == '.rs':
-            uses = re.findall(r"use\s+([^;]+);", content)
+            uses = _RS_USE_RE.findall(content)
             info["dependencies"] = list(set(uses))
             
             if file_path.name == "main.rs":
@@ -99,8 +272,158 @@ def get_file_info(file_path):
         
     return info
 
-def build_project_index(root_path):
-    """Build comprehensive project index."""
+def _walk(root, ignore_set=IGNORE_DIRS):
+    """Yield (path, DirEntry) for every file under root.
+    
+    Ignored directories are pruned by name before descending into them, and
+    the indexer's own artifacts under .claude are skipped.
+    """
+    claude_dir = os.path.join(root, '.claude')
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        in_claude_dir = current == claude_dir
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if in_claude_dir and _is_index_artifact(entry.name):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in ignore_set:
+                                stack.append(entry.path)
+                        elif entry.is_file():
+                            yield Path(entry.path), entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+def _dumps(data, indent=False):
+    """Serialize data to JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(data, indent=2).encode('utf-8')
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+def _write_atomic(path, write):
+    """Write a file via a temp file and rename so readers never see partial output."""
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+def _write_json_atomic(path, data, indent=False):
+    """Atomically write data as a JSON document."""
+    _write_atomic(path, lambda f: f.write(_dumps(data, indent)))
+
+def load_index(index_path):
+    """Load a previously saved index, or None if missing or unreadable."""
+    try:
+        data = load_index_fields(index_path, INDEX_FIELDS)
+        return {key: data[key] for key in INDEX_FIELDS}
+    except Exception:
+        return None
+
+def save_index(index_path, index):
+    """Atomically write the index shards to disk.
+    
+    meta.json, stats.json, structure.json and deps.json (JSONL) are written
+    to .claude/.index/ so readers can load only what they need. The legacy
+    single-file .index.json is also written unless CLAUDE_LEGACY_INDEX=0;
+    set CLAUDE_COMPACT_INDEX=1 to skip its indentation and whitespace.
+    """
+    shards = shard_dir(index_path)
+    shards.mkdir(parents=True, exist_ok=True)
+    
+    def write_deps(f):
+        for path, deps in index["dependencies_graph"].items():
+            f.write(_dumps({"path": path, "dependencies": deps}) + b"\n")
+    
+    # meta.json marks the shards as present, so it is written last
+    _write_atomic(shards / 'deps.json', write_deps)
+    _write_json_atomic(shards / 'structure.json', index["structure"])
+    _write_json_atomic(shards / 'stats.json', {key: index[key] for key in STATS_FIELDS})
+    _write_json_atomic(shards / 'meta.json', {key: index[key] for key in META_FIELDS})
+    
+    if os.environ.get('CLAUDE_LEGACY_INDEX', '1') == '0':
+        return
+    _write_json_atomic(index_path, index, indent=os.environ.get('CLAUDE_COMPACT_INDEX') != '1')
+
+def _add_file_stats(index, rel_path, info):
+    """Count a file in the index stats and special file lists."""
+    index["stats"]["total_files"] += 1
+    file_type = info["type"]
+    index["stats"]["by_type"][file_type] = index["stats"]["by_type"].get(file_type, 0) + 1
+    
+    if info["purpose"]:
+        purpose = info["purpose"]
+        index["stats"]["by_purpose"][purpose] = index["stats"]["by_purpose"].get(purpose, 0) + 1
+        
+        # Categorize special files
+        if info["importance"] in ["critical", "high"]:
+            index["critical_files"].append(rel_path)
+        if info["purpose"] == "entry_point":
+            index["entry_points"].append(rel_path)
+        elif info["purpose"] == "test":
+            index["test_files"].append(rel_path)
+
+def _remove_file_stats(index, rel_path, entry):
+    """Undo _add_file_stats for a file using its structure entry."""
+    def decrement(counts, key):
+        if key in counts:
+            counts[key] -= 1
+            if counts[key] <= 0:
+                del counts[key]
+    
+    index["stats"]["total_files"] = max(0, index["stats"]["total_files"] - 1)
+    decrement(index["stats"]["by_type"], entry["type"])
+    if entry["purpose"]:
+        decrement(index["stats"]["by_purpose"], entry["purpose"])
+    
+    for key in ["critical_files", "entry_points", "test_files"]:
+        if rel_path in index[key]:
+            index[key].remove(rel_path)
+
+def _set_structure_entry(index, rel_path, info):
+    """Insert a file into the nested directory structure."""
+    parts = rel_path.split('/')
+    current = index["structure"]
+    for part in parts[:-1]:
+        if part not in current:
+            current[part] = {}
+        current = current[part]
+    current[parts[-1]] = {
+        "type": info["type"],
+        "purpose": info["purpose"],
+        "importance": info["importance"]
+    }
+
+def _pop_structure_entry(index, rel_path):
+    """Remove a file from the directory structure, pruning empty directories."""
+    parts = rel_path.split('/')
+    trail = [index["structure"]]
+    for part in parts[:-1]:
+        node = trail[-1].get(part)
+        if not isinstance(node, dict):
+            return None
+        trail.append(node)
+    
+    entry = trail[-1].pop(parts[-1], None)
+    for depth in range(len(parts) - 1, 0, -1):
+        if trail[depth]:
+            break
+        del trail[depth - 1][parts[depth - 1]]
+    return entry
+
+def build_full_index(root_path, cache=None):
+    """Build comprehensive project index.
+    
+    If a metadata cache is given, unchanged files reuse their cached info and
+    the cache is updated in place to reflect the current tree.
+    """
     index = {
         "version": "1.0",
         "generated": datetime.now().isoformat(),
@@ -117,63 +440,179 @@ def build_project_index(root_path):
         "dependencies_graph": {}
     }
     
-    # Patterns to ignore
-    ignore_patterns = [
-        '.git', 'node_modules', '__pycache__', '.pytest_cache',
-        'dist', 'build', 'target', '.next', '.venv', 'env'
-    ]
+    cache = {} if cache is None else cache
+    fresh = {}
+    
+    def scan(item):
+        file_path, dir_entry = item
+        rel_path = str(file_path.relative_to(root_path))
+        try:
+            return rel_path, _scan_file(file_path, cache.get(rel_path), dir_entry.stat())
+        except OSError:
+            # Deleted between the walk and the scan (temp files, build output)
+            return rel_path, None
     
-    files_data = {}
+    # File reads release the GIL, so overlap them across threads
+    paths = list(_walk(str(root_path)))
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(scan, paths))
     
-    for file_path in Path(root_path).rglob('*'):
-        # Skip ignored directories
-        if any(pattern in str(file_path) for pattern in ignore_patterns):
+    # Stats, directory structure and dependency graph in a single pass
+    for rel_path, entry in results:
+        if entry is None:
             continue
-            
-        if file_path.is_file():
-            rel_path = file_path.relative_to(root_path)
-            info = get_file_info(file_path)
-            files_data[str(rel_path)] = info
-            
-            # Update stats
-            index["stats"]["total_files"] += 1
-            file_type = info["type"]
-            index["stats"]["by_type"][file_type] = index["stats"]["by_type"].get(file_type, 0) + 1
-            
-            if info["purpose"]:
-                purpose = info["purpose"]
-                index["stats"]["by_purpose"][purpose] = index["stats"]["by_purpose"].get(purpose, 0) + 1
-                
-                # Categorize special files
-                if info["importance"] in ["critical", "high"]:
-                    index["critical_files"].append(str(rel_path))
-                if info["purpose"] == "entry_point":
-                    index["entry_points"].append(str(rel_path))
-                elif info["purpose"] == "test":
-                    index["test_files"].append(str(rel_path))
-    
-    # Build directory structure
-    for file_path, info in files_data.items():
-        parts = file_path.split('/')
-        current = index["structure"]
-        for part in parts[:-1]:
-            if part not in current:
-                current[part] = {}
-            current = current[part]
-        current[parts[-1]] = {
-            "type": info["type"],
-            "purpose": info["purpose"],
-            "importance": info["importance"]
-        }
+        fresh[rel_path] = entry
+        info = entry["info"]
+        _add_file_stats(index, rel_path, info)
+        _set_structure_entry(index, rel_path, info)
+        if info["dependencies"]:
+            index["dependencies_graph"][rel_path] = info["dependencies"]
+    
+    # Drop cache entries for files that no longer exist
+    cache.clear()
+    cache.update(fresh)
+    
+    return index
+
+def update_file_in_index(index, root_path, rel_path, cache=None):
+    """Refresh a single file's entry in an existing index.
     
-    # Build dependency graph (simplified)
-    for file_path, info in files_data.items():
+    Handles added, modified and deleted files without walking the tree.
+    """
+    cache = {} if cache is None else cache
+    
+    old_entry = _pop_structure_entry(index, rel_path)
+    if old_entry is not None:
+        _remove_file_stats(index, rel_path, old_entry)
+    index["dependencies_graph"].pop(rel_path, None)
+    
+    file_path = Path(root_path) / rel_path
+    try:
+        st = file_path.stat()
+    except OSError:
+        st = None
+    
+    if st is not None and stat.S_ISREG(st.st_mode):
+        cache[rel_path] = _scan_file(file_path, cache.get(rel_path), st)
+        info = cache[rel_path]["info"]
+        _add_file_stats(index, rel_path, info)
+        _set_structure_entry(index, rel_path, info)
         if info["dependencies"]:
-            index["dependencies_graph"][file_path] = info["dependencies"]
+            index["dependencies_graph"][rel_path] = info["dependencies"]
+    else:
+        cache.pop(rel_path, None)
+    
+    index["generated"] = datetime.now().isoformat()
+    return index
+
+def _relative_to_root(file_path, root_path):
+    """Return file_path relative to root_path, or None if outside the project."""
+    root = Path(os.path.abspath(root_path))
+    path = Path(os.path.abspath(root / file_path))
+    try:
+        rel_path = str(path.relative_to(root))
+    except ValueError:
+        return None
+    parts = Path(rel_path).parts
+    if any(part in IGNORE_DIRS for part in parts[:-1]):
+        return None
+    if len(parts) > 1 and parts[0] == '.claude' and _is_index_artifact(parts[1]):
+        return None
+    return rel_path
+
+def _apply_updates(project_root, rel_paths=None):
+    """Patch the given files into the saved index.
     
+    Rebuilds the whole index when no paths are given or none exists yet.
+    """
+    index_path = Path(project_root) / '.claude' / '.index.json'
+    cache = _meta_cache_load(index_path)
+    index = load_index(index_path) if rel_paths is not None else None
+    
+    if index is not None:
+        for rel_path in rel_paths:
+            update_file_in_index(index, project_root, rel_path, cache)
+    else:
+        # Full rebuild, re-reading only files changed since the last run
+        index = build_full_index(project_root, cache)
+    
+    save_index(index_path, index)
+    _meta_cache_save(index_path, cache)
     return index
 
+def _enqueue(queue_path, rel_path):
+    """Append a changed file to the pending update queue."""
+    with open(queue_path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.write(rel_path + '\n')
+
+def _take_queue(queue_path):
+    """Empty the queue and return its distinct paths in arrival order."""
+    try:
+        with open(queue_path, 'r+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            lines = f.read().splitlines()
+            f.seek(0)
+            f.truncate()
+    except FileNotFoundError:
+        return []
+    return list(dict.fromkeys(line for line in lines if line))
+
+def _try_lock(lock_path):
+    """Take the drainer lock without blocking; returns the fd or None if held."""
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+def drain_queue(project_root, lock_fd):
+    """Coalesce queued updates into index rewrites until the queue stays empty.
+    
+    Waits DEBOUNCE_SECONDS before each batch so bursts of edits (e.g. a
+    MultiEdit across many files) produce a single rewrite. Releases lock_fd
+    when done.
+    """
+    claude_dir = Path(project_root) / '.claude'
+    queue_path = claude_dir / '.index_queue'
+    lock_path = claude_dir / '.index.pid'
+    
+    while True:
+        os.ftruncate(lock_fd, 0)
+        os.pwrite(lock_fd, str(os.getpid()).encode(), 0)
+        time.sleep(DEBOUNCE_SECONDS)
+        rel_paths = _take_queue(queue_path)
+        if rel_paths:
+            _apply_updates(project_root, rel_paths)
+            continue
+        
+        os.close(lock_fd)
+        # A path queued after the last check but before the unlock would be
+        # stranded, since its hook saw the lock held and did not fork
+        if not (queue_path.exists() and queue_path.stat().st_size):
+            return
+        lock_fd = _try_lock(lock_path)
+        if lock_fd is None:
+            return
+
+def _spawn_drainer(project_root, lock_fd):
+    """Fork a detached process that drains the queue while the hook returns."""
+    if os.fork() > 0:
+        return
+    try:
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        drain_queue(project_root, lock_fd)
+    finally:
+        os._exit(0)
+
 def main():
+    changed_file = None
+    
     # Check if stdin has data (when called as a hook)
     if not sys.stdin.isatty():
         try:
@@ -182,23 +621,50 @@ def main():
             tool_name = input_data.get('tool_name', '')
             if tool_name not in ['Write', 'Edit', 'MultiEdit']:
                 sys.exit(0)
-        except:
+            changed_file = input_data.get('tool_input', {}).get('file_path')
+        except Exception:
             # If no valid JSON, assume manual run
             pass
     
     # Get project root
     project_root = os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd())
     
-    # Build and save index
-    index = build_project_index(project_root)
-    
     index_path = Path(project_root) / '.claude' / '.index.json'
     index_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(index_path, 'w') as f:
-        json.dump(index, f, indent=2)
-        
-    print(f"✓ Updated project index: {index['stats']['total_files']} files indexed")
+    use_queue = (fcntl is not None and hasattr(os, 'fork')
+                 and os.environ.get('CLAUDE_SYNC_INDEX') != '1')
+    
+    if use_queue and '--drain' in sys.argv[1:]:
+        # Flush pending queued updates in the foreground
+        lock_fd = os.open(index_path.with_name('.index.pid'), os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        drain_queue(project_root, lock_fd)
+        print("✓ Drained pending index updates")
+        return
+    
+    if not changed_file or not index_exists(index_path):
+        index = _apply_updates(project_root)
+        print(f"✓ Updated project index: {index['stats']['total_files']} files indexed")
+        return
+    
+    rel_path = _relative_to_root(changed_file, project_root)
+    if rel_path is None:
+        sys.exit(0)
+    
+    if not use_queue:
+        # Patch only the edited file into the existing index
+        index = _apply_updates(project_root, [rel_path])
+        print(f"✓ Updated project index: {index['stats']['total_files']} files indexed")
+        return
+    
+    # Queue the file and let a single background drainer batch the rewrite
+    _enqueue(index_path.with_name('.index_queue'), rel_path)
+    lock_fd = _try_lock(index_path.with_name('.index.pid'))
+    if lock_fd is not None:
+        _spawn_drainer(project_root, lock_fd)
+        os.close(lock_fd)
+    print(f"✓ Queued project index update: {rel_path}")
         
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -8,8 +8,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import the indexer functions
-from indexer import build_project_index
-import json
+from indexer import build_full_index, save_index
 from pathlib import Path
 
 def main():
@@ -17,14 +16,12 @@ def main():
     print(f"Building index for: {project_root}")
     
     # Build index
-    index = build_project_index(project_root)
+    index = build_full_index(project_root)
     
     # Save index
     index_path = Path(project_root) / '.claude' / '.index.json'
     index_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(index_path, 'w') as f:
-        json.dump(index, f, indent=2)
+    save_index(index_path, index)
     
     # Print summary
     print(f"✓ Index created: {index_path}")
@@ -7,34 +7,42 @@ import json
 import sys
 import os
 import re
+from itertools import islice
 from pathlib import Path
 
+# Add hooks directory to path to import the index reader module
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Prompts that should trigger index injection
+INJECT_PATTERNS = [
+    r'/readup',
+    r'understand.*project',
+    r'explain.*codebase',
+    r'what.*files.*here',
+    r'project.*structure',
+    r'how.*organized',
+    r'architecture'
+]
+_INJECT_PATTERNS = [re.compile(pattern) for pattern in INJECT_PATTERNS]
+
 def should_inject_index(prompt):
     """Determine if we should inject the project index."""
-    patterns = [
-        r'/readup',
-        r'understand.*project',
-        r'explain.*codebase',
-        r'what.*files.*here',
-        r'project.*structure',
-        r'how.*organized',
-        r'architecture'
-    ]
-    
     prompt_lower = prompt.lower()
-    return any(re.search(pattern, prompt_lower) for pattern in patterns)
+    return any(pattern.search(prompt_lower) for pattern in _INJECT_PATTERNS)
 
 def get_enhanced_context():
     """Get enhanced project context for deep understanding."""
+    # Imported here so prompts that don't trigger injection skip the cost
+    from index_reader import index_exists, iter_dependencies, load_index_fields
+    
     project_root = os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd())
     context_parts = []
     
     # Load full index
     index_path = Path(project_root) / '.claude' / '.index.json'
-    if index_path.exists():
+    if index_exists(index_path):
         try:
-            with open(index_path) as f:
-                index = json.load(f)
+            index = load_index_fields(index_path, ['structure', 'stats'])
             
             context_parts.append("## 🗂️ Complete Project Structure Analysis\n")
             
@@ -43,10 +51,9 @@ def get_enhanced_context():
             context_parts.append(json.dumps(index['structure'], indent=2))
             
             context_parts.append("\n### Dependency Graph:")
-            if index.get('dependencies_graph'):
-                for file, deps in list(index['dependencies_graph'].items())[:20]:
-                    if deps:
-                        context_parts.append(f"- {file}: imports {', '.join(deps[:5])}")
+            for file, deps in islice(iter_dependencies(index_path), 20):
+                if deps:
+                    context_parts.append(f"- {file}: imports {', '.join(deps[:5])}")
             
             context_parts.append("\n### Statistics:")
             context_parts.append(f"- Total files: {index['stats']['total_files']}")
@@ -7,41 +7,85 @@ import json
 import sys
 import os
 import subprocess
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
 
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+# Add hooks directory to path to import the index reader module
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from index_reader import index_exists, load_index_fields
+from todo_persister import load_pending_todos
+
+# One shell round trip for every git query the session summary needs
+GIT_SUMMARY_SCRIPT = (
+    "git rev-parse --git-dir >/dev/null 2>&1 || exit 1; "
+    "git log --oneline -10 --since=7.days.ago; echo ---; "
+    "git branch --show-current; echo ---; "
+    "git status --short"
+)
+
+def _recent_changes_pygit2(repo_path):
+    """Collect git summary in-process with pygit2, without spawning git."""
+    repo = pygit2.Repository(repo_path)
+    
+    recent_commits = []
+    if not repo.head_is_unborn:
+        since = time.time() - 7 * 24 * 3600
+        for commit in repo.walk(repo.head.target, pygit2.GIT_SORT_TIME):
+            if commit.commit_time < since or len(recent_commits) >= 10:
+                break
+            summary = commit.message.splitlines()[0] if commit.message else ''
+            recent_commits.append(f"{commit.short_id} {summary}")
+    
+    current_branch = ''
+    if not repo.head_is_detached:
+        current_branch = repo.references['HEAD'].target.split('/', 2)[-1]
+    
+    # "normal" collapses untracked directories to one entry, like git status
+    uncommitted = sum(1 for flags in repo.status(untracked_files='normal').values()
+                      if flags != pygit2.GIT_STATUS_IGNORED)
+    
+    return {
+        "branch": current_branch,
+        "recent_commits": recent_commits,
+        "uncommitted_files": uncommitted
+    }
+
 def get_recent_changes():
     """Get recent git changes if in a git repo."""
     try:
-        # Check if we're in a git repo
-        subprocess.run(['git', 'rev-parse', '--git-dir'], 
-                      capture_output=True, check=True)
+        if pygit2 is not None:
+            repo_path = pygit2.discover_repository(os.getcwd())
+            if repo_path is None:
+                return None
+            try:
+                return _recent_changes_pygit2(repo_path)
+            except Exception:
+                # e.g. repo formats libgit2 can't read; the git CLI may
+                pass
         
-        # Get recent commits
-        result = subprocess.run(
-            ['git', 'log', '--oneline', '-10', '--since=7.days.ago'],
-            capture_output=True, text=True
-        )
-        recent_commits = result.stdout.strip()
+        result = subprocess.run(['sh', '-c', GIT_SUMMARY_SCRIPT],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
         
-        # Get current branch
-        result = subprocess.run(
-            ['git', 'branch', '--show-current'],
-            capture_output=True, text=True
-        )
-        current_branch = result.stdout.strip()
-        
-        # Get uncommitted changes
-        result = subprocess.run(
-            ['git', 'status', '--short'],
-            capture_output=True, text=True
-        )
-        uncommitted = result.stdout.strip()
+        sections = [[]]
+        for line in result.stdout.split('\n'):
+            if line == '---':
+                sections.append([])
+            elif line.strip():
+                sections[-1].append(line)
+        recent_commits, branch, uncommitted = (sections + [[], [], []])[:3]
         
         return {
-            "branch": current_branch,
-            "recent_commits": recent_commits.split('\n') if recent_commits else [],
-            "uncommitted_files": len(uncommitted.split('\n')) if uncommitted else 0
+            "branch": branch[0].strip() if branch else '',
+            "recent_commits": recent_commits,
+            "uncommitted_files": len(uncommitted)
         }
     except:
         return None
@@ -53,10 +97,10 @@ def load_project_context():
     
     # Load project index if it exists
     index_path = Path(project_root) / '.claude' / '.index.json'
-    if index_path.exists():
+    if index_exists(index_path):
         try:
-            with open(index_path) as f:
-                index = json.load(f)
+            index = load_index_fields(
+                index_path, ['stats', 'critical_files', 'entry_points', 'generated'])
             
             context_parts.append("## 📊 Project Index Summary")
             context_parts.append(f"- Total files: {index['stats']['total_files']}")
@@ -99,13 +143,10 @@ def load_project_context():
     todo_path = Path(project_root) / '.claude' / '.todo_state.json'
     if todo_path.exists():
         try:
-            with open(todo_path) as f:
-                todos = json.load(f)
-            
-            pending = [t for t in todos if t['status'] == 'pending']
+            pending = load_pending_todos(todo_path, limit=5)
             if pending:
                 context_parts.append("\n## 📋 Pending Tasks from Last Session")
-                for todo in pending[:5]:
+                for todo in pending:
                     context_parts.append(f"- {todo['content']}")
         except:
             pass
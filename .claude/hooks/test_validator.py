@@ -7,11 +7,80 @@ import json
 import sys
 import os
 import subprocess
+import hashlib
+import re
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from index_reader import IGNORE_DIRS
+
+# Files whose contents decide which test commands are available
+TEST_CONFIG_FILES = ['package.json', 'Cargo.toml', 'Makefile']
+
+# JS/TS string literals and comments, whose brackets don't affect balance
+_JS_LITERAL_RE = re.compile(
+    rb'"(?:[^"\\\n]|\\.)*"'
+    rb"|'(?:[^'\\\n]|\\.)*'"
+    rb'|`(?:[^`\\]|\\.)*`'
+    rb'|//[^\n]*'
+    rb'|/\*.*?\*/',
+    re.S)
+
+# Every byte except the brackets whose balance is checked
+_NON_BRACKET_BYTES = bytes(b for b in range(256) if b not in b'{}()')
+
+def _strip_js_literals(buf):
+    """Remove strings, template literals and comments from JS/TS source bytes."""
+    return _JS_LITERAL_RE.sub(b'', buf)
+
+def _has_pytest(root, ignore=IGNORE_DIRS):
+    """Return True as soon as any test_*.py file is found under root."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in ignore]
+        if any(f.startswith('test_') and f.endswith('.py') for f in filenames):
+            return True
+    return False
+
+def _config_hash(project_root, has_pytest):
+    """Hash the inputs that determine which test commands exist."""
+    digest = hashlib.sha1(b'pytest\0' if has_pytest else b'\0')
+    for name in TEST_CONFIG_FILES:
+        path = Path(project_root) / name
+        if path.exists():
+            digest.update(name.encode() + b'\0' + path.read_bytes() + b'\0')
+    return digest.hexdigest()
+
 def detect_test_command():
-    """Detect available test commands in the project."""
+    """Detect available test commands, cached until config files change.
+    
+    Results are stored in .claude/.test_commands.json keyed by a hash of
+    package.json, Cargo.toml and Makefile plus whether any test_*.py file
+    exists, which is re-checked on every call.
+    """
     project_root = os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd())
+    cache_path = Path(project_root) / '.claude' / '.test_commands.json'
+    has_pytest = _has_pytest(project_root)
+    cfg_hash = _config_hash(project_root, has_pytest)
+    
+    try:
+        with open(cache_path) as f:
+            cached = json.load(f)
+        if cached.get('hash') == cfg_hash:
+            return cached.get('commands', [])
+    except Exception:
+        pass
+    
+    commands = _detect_test_commands(project_root, has_pytest)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w') as f:
+            json.dump({"hash": cfg_hash, "commands": commands}, f, indent=2)
+    except OSError:
+        pass
+    return commands
+
+def _detect_test_commands(project_root, has_pytest):
+    """Detect available test commands in the project."""
     commands = []
     
     # Check package.json for npm/yarn scripts
@@ -41,7 +110,7 @@ def detect_test_command():
             pass
     
     # Check for pytest
-    if any(Path(project_root).glob('**/test_*.py')):
+    if has_pytest:
         commands.append('pytest')
     
     # Check for cargo (Rust)
@@ -82,13 +151,15 @@ def run_validation(file_path):
     elif file_path.endswith(('.js', '.ts', '.jsx', '.tsx')):
         # Check if file has obvious syntax errors
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-                # Basic bracket matching
-                if content.count('{') != content.count('}'):
-                    feedback.append(f"⚠️ Possible bracket mismatch in {file_path}")
-                if content.count('(') != content.count(')'):
-                    feedback.append(f"⚠️ Possible parenthesis mismatch in {file_path}")
+            with open(file_path, 'rb') as f:
+                code = _strip_js_literals(f.read())
+            # Bracket matching, ignoring brackets inside strings and comments.
+            # One translate pass keeps only brackets, so counting is cheap.
+            brackets = code.translate(None, _NON_BRACKET_BYTES)
+            if brackets.count(b'{') != brackets.count(b'}'):
+                feedback.append(f"⚠️ Possible bracket mismatch in {file_path}")
+            if brackets.count(b'(') != brackets.count(b')'):
+                feedback.append(f"⚠️ Possible parenthesis mismatch in {file_path}")
         except:
             pass
     
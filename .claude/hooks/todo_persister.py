@@ -9,6 +9,53 @@ import os
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+def _tail_lines(path, chunk=65536):
+    """Yield the lines of a file from last to first, reading backwards in chunks."""
+    with open(path, 'rb') as f:
+        pos = os.path.getsize(path)
+        remainder = b''
+        while pos > 0:
+            read_size = min(chunk, pos)
+            pos -= read_size
+            f.seek(pos)
+            lines = (f.read(read_size) + remainder).split(b'\n')
+            # The first piece may be the tail of a line that started earlier
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                yield line.decode('utf-8', 'ignore')
+        yield remainder.decode('utf-8', 'ignore')
+
+def load_pending_todos(todo_path, limit=5):
+    """Return up to limit pending todos from a saved todo state file.
+    
+    Streams the todos array with ijson when available and stops once enough
+    pending items are found.
+    """
+    pending = []
+    with open(todo_path, 'rb') as f:
+        if ijson is not None:
+            todos = ijson.items(f, 'todos.item')
+        else:
+            todos = _loads(f.read()).get('todos', [])
+        for todo in todos:
+            if todo.get('status') == 'pending':
+                pending.append(todo)
+                if len(pending) >= limit:
+                    break
+    return pending
+
 def save_todo_state():
     """Extract and save current todo state from transcript."""
     try:
@@ -18,20 +65,21 @@ def save_todo_state():
         if not transcript_path or not os.path.exists(transcript_path):
             return
         
-        # Read the transcript
-        with open(transcript_path, 'r') as f:
-            todos = []
-            for line in f:
-                try:
-                    entry = json.loads(line)
-                    # Look for TodoWrite tool usage
-                    if (entry.get('type') == 'tool_use' and 
-                        entry.get('name') == 'TodoWrite'):
-                        todos_data = entry.get('input', {}).get('todos', [])
-                        if todos_data:
-                            todos = todos_data  # Keep the latest todo state
-                except:
-                    continue
+        # Scan the transcript from the end; only the latest todo state matters
+        todos = []
+        for line in _tail_lines(transcript_path):
+            if '"TodoWrite"' not in line:
+                continue
+            try:
+                entry = _loads(line)
+                # Look for TodoWrite tool usage
+                if (entry.get('type') == 'tool_use' and 
+                    entry.get('name') == 'TodoWrite'):
+                    todos = entry.get('input', {}).get('todos', [])
+                    if todos:
+                        break
+            except:
+                continue
         
         if todos:
             # Save to project directory
@@ -46,8 +94,11 @@ def save_todo_state():
                 "todos": todos
             }
             
-            with open(todo_path, 'w') as f:
-                json.dump(state, f, indent=2)
+            if orjson is not None:
+                todo_path.write_bytes(orjson.dumps(state, option=orjson.OPT_INDENT_2))
+            else:
+                with open(todo_path, 'w') as f:
+                    json.dump(state, f, indent=2)
             
             # Count pending tasks
             pending_count = len([t for t in todos if t.get('status') == 'pending'])
@@ -92,6 +92,7 @@ download_files() {
     local files=(
         ".claude/settings.json"
         ".claude/hooks/indexer.py"
+        ".claude/hooks/index_reader.py"
         ".claude/hooks/session_loader.py"
         ".claude/hooks/readup_injector.py"
         ".claude/hooks/test_validator.py"
@@ -186,7 +187,12 @@ install_files() {
 configure_gitignore() {
     local gitignore_entries=(
         ".claude/.index.json"
+        ".claude/.index_meta.json"
+        ".claude/.index/"
+        ".claude/.index_queue"
+        ".claude/.index.pid"
         ".claude/.todo_state.json"
+        ".claude/.test_commands.json"
         ".claude/bash_history.log"
         ".claude/settings.local.json"
         ".claude/*.backup.*"
@@ -27,7 +27,12 @@ fi
 if [ -f ".gitignore" ]; then
     if ! grep -q ".claude/.index.json" .gitignore; then
         echo ".claude/.index.json" >> .gitignore
+        echo ".claude/.index_meta.json" >> .gitignore
+        echo ".claude/.index/" >> .gitignore
+        echo ".claude/.index_queue" >> .gitignore
+        echo ".claude/.index.pid" >> .gitignore
         echo ".claude/.todo_state.json" >> .gitignore
+        echo ".claude/.test_commands.json" >> .gitignore
         echo ".claude/bash_history.log" >> .gitignore
         echo ".claude/settings.local.json" >> .gitignore
         echo "✓ Added Claude temp files to .gitignore"